@@ -4,11 +4,27 @@
 from __future__ import annotations
 
 import argparse
+import functools
 import json
 import re
+from collections import defaultdict
 from pathlib import Path
 from typing import Dict, List, Tuple
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dumps_json(payload: Dict, compact: bool = False) -> str:
+    if orjson is not None:
+        option = orjson.OPT_SORT_KEYS if compact else orjson.OPT_SORT_KEYS | orjson.OPT_INDENT_2
+        return orjson.dumps(payload, option=option).decode()
+    if compact:
+        return json.dumps(payload, separators=(",", ":"), sort_keys=True)
+    return json.dumps(payload, indent=2, sort_keys=True)
+
 
 TYPE_MAP = {
     "string": "xsd:string",
@@ -16,62 +32,57 @@ TYPE_MAP = {
     "datetime": "xsd:dateTime",
 }
 
+_SPLIT_RE = re.compile(r"[_\s-]+")
+_BLOCK_RE = re.compile(r"```mermaid\s*\n(.*?)```", re.DOTALL)
+_LINE_RE = re.compile(
+    r"^[ \t]*(?:"
+    r"(?P<entity>[A-Z0-9_]+)[ \t]*\{[ \t]*$"
+    r"|(?P<close>\})[ \t]*$"
+    r"|(?P<field_type>\w+)[ \t]+(?P<field_name>[A-Za-z0-9_]+)[ \t]*$"
+    r"|(?P<rel_left>[A-Z0-9_]+)[ \t]+[^A-Z0-9_\n]+[ \t]*(?P<rel_right>[A-Z0-9_]+)[ \t]*:[ \t]*(?P<rel_label>[A-Za-z0-9_ -]+?)[ \t]*$"
+    r")",
+    re.MULTILINE,
+)
+
 
+@functools.lru_cache(maxsize=None)
 def to_pascal(name: str) -> str:
-    parts = re.split(r"[_\s-]+", name.strip())
+    parts = _SPLIT_RE.split(name.strip())
     return "".join(p.capitalize() for p in parts if p)
 
 
+@functools.lru_cache(maxsize=None)
 def to_camel(name: str) -> str:
     pascal = to_pascal(name)
     return pascal[:1].lower() + pascal[1:] if pascal else pascal
 
 
-def extract_mermaid_block(text: str) -> List[str]:
-    in_block = False
-    lines: List[str] = []
-    for line in text.splitlines():
-        if line.strip() == "```mermaid":
-            in_block = True
-            continue
-        if in_block and line.strip() == "```":
-            break
-        if in_block:
-            lines.append(line)
-    return lines
+def extract_mermaid_block(text: str) -> str:
+    match = _BLOCK_RE.search(text)
+    return match.group(1) if match else ""
 
 
-def parse_erd(lines: List[str]) -> Tuple[Dict[str, List[Tuple[str, str]]], List[Tuple[str, str, str]]]:
+def parse_erd(block: str) -> Tuple[Dict[str, List[Tuple[str, str]]], List[Tuple[str, str, str]]]:
     entities: Dict[str, List[Tuple[str, str]]] = {}
     relationships: List[Tuple[str, str, str]] = []
 
     current_entity = None
-    for line in lines:
-        stripped = line.strip()
-        if not stripped:
-            continue
-
-        entity_match = re.match(r"^([A-Z0-9_]+)\s*\{\s*$", stripped)
-        if entity_match:
-            current_entity = entity_match.group(1)
+    for match in _LINE_RE.finditer(block):
+        entity = match.group("entity")
+        if entity:
+            current_entity = entity
             entities[current_entity] = []
-            continue
-
-        if stripped == "}":
+        elif match.group("close"):
             current_entity = None
-            continue
-
-        if current_entity:
-            field_match = re.match(r"^(\w+)\s+([A-Za-z0-9_]+)$", stripped)
-            if field_match:
-                field_type, field_name = field_match.groups()
-                entities[current_entity].append((field_name, field_type))
-            continue
-
-        rel_match = re.match(r"^([A-Z0-9_]+)\s+[^A-Z0-9_]+\s+([A-Z0-9_]+)\s*:\s*([A-Za-z0-9_ -]+)$", stripped)
-        if rel_match:
-            left, right, label = rel_match.groups()
-            relationships.append((left, right, label.strip()))
+        elif current_entity:
+            if match.group("field_type"):
+                entities[current_entity].append(
+                    (match.group("field_name"), match.group("field_type"))
+                )
+        elif match.group("rel_left"):
+            relationships.append(
+                (match.group("rel_left"), match.group("rel_right"), match.group("rel_label"))
+            )
 
     return entities, relationships
 
@@ -81,8 +92,8 @@ def build_model(
     relationships: List[Tuple[str, str, str]],
 ) -> Dict[str, Dict]:
     classes = sorted(to_pascal(entity) for entity in entities.keys())
-    data_props: Dict[str, Dict[str, set]] = {}
-    obj_props: Dict[str, Dict[str, set]] = {}
+    data_props: Dict[str, Tuple[set, set]] = defaultdict(lambda: (set(), set()))
+    obj_props: Dict[str, Tuple[set, set]] = defaultdict(lambda: (set(), set()))
 
     for entity, fields in entities.items():
         class_name = to_pascal(entity)
@@ -91,20 +102,26 @@ def build_model(
                 continue
             prop_name = to_camel(field_name)
             xsd_type = TYPE_MAP.get(field_type.lower(), "xsd:string")
-            entry = data_props.setdefault(prop_name, {"domains": set(), "ranges": set()})
-            entry["domains"].add(class_name)
-            entry["ranges"].add(xsd_type)
+            domains, ranges = data_props[prop_name]
+            domains.add(class_name)
+            ranges.add(xsd_type)
 
     for left, right, label in relationships:
         prop_name = f"{to_camel(label)}{to_pascal(right)}"
-        entry = obj_props.setdefault(prop_name, {"domains": set(), "ranges": set()})
-        entry["domains"].add(to_pascal(left))
-        entry["ranges"].add(to_pascal(right))
+        domains, ranges = obj_props[prop_name]
+        domains.add(to_pascal(left))
+        ranges.add(to_pascal(right))
 
     return {
         "classes": classes,
-        "data_props": data_props,
-        "object_props": obj_props,
+        "data_props": {
+            name: (sorted(domains), sorted(ranges))
+            for name, (domains, ranges) in data_props.items()
+        },
+        "object_props": {
+            name: (sorted(domains), sorted(ranges))
+            for name, (domains, ranges) in obj_props.items()
+        },
     }
 
 
@@ -113,73 +130,65 @@ def build_ttl(model: Dict[str, Dict]) -> str:
     data_props = model["data_props"]
     obj_props = model["object_props"]
 
-    lines: List[str] = []
-    lines.append("@prefix : <http://example.org/sintology#> .")
-    lines.append("@prefix owl: <http://www.w3.org/2002/07/owl#> .")
-    lines.append("@prefix rdf: <http://www.w3.org/1999/02/22-rdf-syntax-ns#> .")
-    lines.append("@prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .")
-    lines.append("@prefix xsd: <http://www.w3.org/2001/XMLSchema#> .")
-    lines.append("")
-    lines.append(":Ontology a owl:Ontology .")
-    lines.append("")
-
-    for class_name in classes:
-        lines.append(f":{class_name} a owl:Class ;")
-        lines.append(f"  rdfs:label \"{class_name}\" .")
-        lines.append("")
-
-    for prop_name, meta in sorted(data_props.items()):
-        domains = meta["domains"]
-        ranges = meta["ranges"]
-        domain_value = "owl:Thing" if len(domains) != 1 else f":{next(iter(domains))}"
-        range_value = "xsd:string" if len(ranges) != 1 else next(iter(ranges))
-        lines.append(f":{prop_name} a owl:DatatypeProperty ;")
-        lines.append(f"  rdfs:domain {domain_value} ;")
-        lines.append(f"  rdfs:range {range_value} .")
-        lines.append("")
-
-    for prop_name, meta in sorted(obj_props.items()):
-        domains = meta["domains"]
-        ranges = meta["ranges"]
-        domain_value = "owl:Thing" if len(domains) != 1 else f":{next(iter(domains))}"
-        range_value = "owl:Thing" if len(ranges) != 1 else f":{next(iter(ranges))}"
-        lines.append(f":{prop_name} a owl:ObjectProperty ;")
-        lines.append(f"  rdfs:domain {domain_value} ;")
-        lines.append(f"  rdfs:range {range_value} .")
-        lines.append("")
+    lines: List[str] = [
+        "@prefix : <http://example.org/sintology#> .\n"
+        "@prefix owl: <http://www.w3.org/2002/07/owl#> .\n"
+        "@prefix rdf: <http://www.w3.org/1999/02/22-rdf-syntax-ns#> .\n"
+        "@prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .\n"
+        "@prefix xsd: <http://www.w3.org/2001/XMLSchema#> .\n"
+        "\n"
+        ":Ontology a owl:Ontology .\n"
+    ]
+
+    lines.extend(
+        f":{class_name} a owl:Class ;\n  rdfs:label \"{class_name}\" .\n"
+        for class_name in classes
+    )
+
+    lines.extend(
+        f":{prop_name} a owl:DatatypeProperty ;\n"
+        f"  rdfs:domain {'owl:Thing' if len(domains) != 1 else ':' + domains[0]} ;\n"
+        f"  rdfs:range {'xsd:string' if len(ranges) != 1 else ranges[0]} .\n"
+        for prop_name, (domains, ranges) in sorted(data_props.items())
+    )
+
+    lines.extend(
+        f":{prop_name} a owl:ObjectProperty ;\n"
+        f"  rdfs:domain {'owl:Thing' if len(domains) != 1 else ':' + domains[0]} ;\n"
+        f"  rdfs:range {'owl:Thing' if len(ranges) != 1 else ':' + ranges[0]} .\n"
+        for prop_name, (domains, ranges) in sorted(obj_props.items())
+    )
 
     return "\n".join(lines).rstrip() + "\n"
 
 
-def build_json(model: Dict[str, Dict]) -> str:
+def build_json(model: Dict[str, Dict], compact: bool = False) -> str:
     classes = [{"name": name, "label": name} for name in model["classes"]]
-    data_props = []
-    for name, meta in sorted(model["data_props"].items()):
-        data_props.append(
-            {
-                "name": name,
-                "domain": sorted(meta["domains"]),
-                "range": sorted(meta["ranges"]),
-                "kind": "datatype",
-            }
-        )
-
-    obj_props = []
-    for name, meta in sorted(model["object_props"].items()):
-        obj_props.append(
-            {
-                "name": name,
-                "domain": sorted(meta["domains"]),
-                "range": sorted(meta["ranges"]),
-                "kind": "object",
-            }
-        )
+    data_props = [
+        {
+            "name": name,
+            "domain": domains,
+            "range": ranges,
+            "kind": "datatype",
+        }
+        for name, (domains, ranges) in sorted(model["data_props"].items())
+    ]
+
+    obj_props = [
+        {
+            "name": name,
+            "domain": domains,
+            "range": ranges,
+            "kind": "object",
+        }
+        for name, (domains, ranges) in sorted(model["object_props"].items())
+    ]
 
     payload = {
         "classes": classes,
         "properties": data_props + obj_props,
     }
-    return json.dumps(payload, indent=2, sort_keys=True) + "\n"
+    return dumps_json(payload, compact=compact) + "\n"
 
 
 def main() -> None:
@@ -187,6 +196,11 @@ def main() -> None:
     parser.add_argument("--erd", default="erd/erd.md", help="Path to ERD markdown")
     parser.add_argument("--out", default="ontology/sintology.ttl", help="Output Turtle path")
     parser.add_argument("--json", default="ontology/ontology.json", help="Output JSON schema path")
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="Write the JSON schema without indentation (faster to parse, smaller on disk)",
+    )
     args = parser.parse_args()
 
     erd_path = Path(args.erd)
@@ -194,14 +208,14 @@ def main() -> None:
     json_path = Path(args.json)
 
     text = erd_path.read_text(encoding="utf-8")
-    mermaid_lines = extract_mermaid_block(text)
-    if not mermaid_lines:
+    mermaid_block = extract_mermaid_block(text)
+    if not mermaid_block:
         raise SystemExit("No Mermaid block found in ERD file.")
 
-    entities, relationships = parse_erd(mermaid_lines)
+    entities, relationships = parse_erd(mermaid_block)
     model = build_model(entities, relationships)
     ttl = build_ttl(model)
-    json_payload = build_json(model)
+    json_payload = build_json(model, compact=args.compact)
 
     out_path.parent.mkdir(parents=True, exist_ok=True)
     out_path.write_text(ttl, encoding="utf-8")
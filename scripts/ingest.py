@@ -4,21 +4,146 @@
 from __future__ import annotations
 
 import argparse
+import itertools
 import json
-import uuid
+import os
+import sys
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+@dataclass(slots=True)
+class Node:
+    id: str
+    cls: str
+    properties: Dict[str, Any]
+
+    @classmethod
+    def from_dict(cls, payload: Dict[str, Any]) -> "Node":
+        return cls(payload["id"], payload["class"], payload.get("properties", {}))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"id": self.id, "class": self.cls, "properties": self.properties}
+
+
+@dataclass(slots=True)
+class Edge:
+    id: str
+    type: str
+    src: str
+    dst: str
+
+    @classmethod
+    def from_dict(cls, payload: Dict[str, Any]) -> "Edge":
+        return cls(payload["id"], payload["type"], payload["from"], payload["to"])
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"id": self.id, "type": self.type, "from": self.src, "to": self.dst}
+
+
+def graph_from_payload(payload: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "nodes": [Node.from_dict(node) for node in payload.get("nodes", [])],
+        "edges": [Edge.from_dict(edge) for edge in payload.get("edges", [])],
+    }
+
+
+def graph_to_payload(graph: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "nodes": [node.to_dict() for node in graph.get("nodes", [])],
+        "edges": [edge.to_dict() for edge in graph.get("edges", [])],
+    }
+
+
+def dumps_json(payload: Dict[str, Any], compact: bool = False) -> str:
+    if orjson is not None:
+        option = orjson.OPT_SORT_KEYS if compact else orjson.OPT_SORT_KEYS | orjson.OPT_INDENT_2
+        return orjson.dumps(payload, option=option).decode()
+    if compact:
+        return json.dumps(payload, separators=(",", ":"), sort_keys=True)
+    return json.dumps(payload, indent=2, sort_keys=True)
 
 
 def load_json(path: Path, default: Dict[str, Any]) -> Dict[str, Any]:
     if not path.exists():
         return default
+    if orjson is not None:
+        return orjson.loads(path.read_bytes())
     return json.loads(path.read_text(encoding="utf-8"))
 
 
-def save_json(path: Path, payload: Dict[str, Any]) -> None:
+def save_json(path: Path, payload: Dict[str, Any], compact: bool = False) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    tmp_path.write_text(dumps_json(payload, compact=compact) + "\n", encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+def append_journal(path: Path, records: List[Tuple[str, Dict[str, Any]]]) -> None:
+    if not records:
+        return
     path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(payload, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    with path.open("a", encoding="utf-8") as handle:
+        for op, payload in records:
+            handle.write(dumps_json({"op": op, "payload": payload}, compact=True) + "\n")
+
+
+def journal_deltas(
+    path: Path, graph: Dict[str, Any], node_count: int, edge_count: int
+) -> Tuple[int, int]:
+    nodes = graph.get("nodes", [])
+    edges = graph.get("edges", [])
+    records = [("add_node", node.to_dict()) for node in nodes[node_count:]]
+    records += [("add_edge", edge.to_dict()) for edge in edges[edge_count:]]
+    append_journal(path, records)
+    return len(nodes), len(edges)
+
+
+def replay_journal(path: Path, graph: Dict[str, Any]) -> None:
+    if not path.exists():
+        return
+    nodes = graph.setdefault("nodes", [])
+    edges = graph.setdefault("edges", [])
+    node_ids = {node.id for node in nodes}
+    edge_ids = {edge.id for edge in edges}
+    with path.open("r", encoding="utf-8") as handle:
+        for line in handle:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # A torn final line is what an interrupted session leaves
+                # behind; everything before it is still good. The next
+                # compaction discards the corrupt tail.
+                print(f"Warning: discarding corrupt journal tail in {path}", file=sys.stderr)
+                break
+            payload = record.get("payload", {})
+            if record.get("op") == "add_node" and payload["id"] not in node_ids:
+                nodes.append(Node.from_dict(payload))
+                node_ids.add(payload["id"])
+            elif record.get("op") == "add_edge" and payload["id"] not in edge_ids:
+                edges.append(Edge.from_dict(payload))
+                edge_ids.add(payload["id"])
+
+
+def compact_journal(
+    data_path: Path, journal_path: Path, graph: Dict[str, Any], compact: bool = False
+) -> None:
+    save_json(data_path, graph_to_payload(graph), compact=compact)
+    if journal_path.exists():
+        journal_path.unlink()
+
+
+def new_id() -> str:
+    return os.urandom(16).hex()
 
 
 def prompt(text: str) -> str:
@@ -28,20 +153,23 @@ def prompt(text: str) -> str:
 def select_option(title: str, options: List[str], allow_skip: bool = False) -> str:
     if not options:
         return ""
-    print(f"\n{title}")
-    for idx, option in enumerate(options, start=1):
-        print(f"  {idx}. {option}")
+    out = [f"\n{title}\n"]
+    out.extend(f"  {idx}. {option}\n" for idx, option in enumerate(options, start=1))
     if allow_skip:
-        print("  0. Skip")
+        out.append("  0. Skip\n")
+    sys.stdout.write("".join(out))
 
     while True:
         choice = prompt("Select: ")
         if allow_skip and choice == "0":
             return ""
-        if choice.isdigit():
+        try:
             index = int(choice) - 1
-            if 0 <= index < len(options):
-                return options[index]
+        except ValueError:
+            print("Invalid selection. Try again.")
+            continue
+        if 0 <= index < len(options):
+            return options[index]
         print("Invalid selection. Try again.")
 
 
@@ -49,9 +177,19 @@ def get_class_names(ontology: Dict[str, Any]) -> List[str]:
     return [entry["name"] for entry in ontology.get("classes", [])]
 
 
+# The ontology is never mutated once loaded, so scan results can be memoized;
+# the ontology's identity is part of the key so a different ontology dict
+# never sees another's cached results.
+_filter_cache: Dict[Tuple[int, str, str], List[Dict[str, Any]]] = {}
+
+
 def filter_properties(
     ontology: Dict[str, Any], class_name: str, kind: str
 ) -> List[Dict[str, Any]]:
+    key = (id(ontology), class_name, kind)
+    cached = _filter_cache.get(key)
+    if cached is not None:
+        return cached
     properties = []
     for prop in ontology.get("properties", []):
         if prop.get("kind") != kind:
@@ -59,31 +197,35 @@ def filter_properties(
         domains = prop.get("domain", [])
         if class_name in domains or "owl:Thing" in domains:
             properties.append(prop)
+    _filter_cache[key] = properties
     return properties
 
 
-def label_for_node(node: Dict[str, Any]) -> str:
-    props = node.get("properties", {})
-    for key in ("name", "fullName", "handle", "title"):
-        if key in props and props[key]:
-            return str(props[key])
-    return node["id"][:8]
+def label_for_node(node: Node) -> str:
+    props = node.properties
+    label = (
+        props.get("name")
+        or props.get("fullName")
+        or props.get("handle")
+        or props.get("title")
+    )
+    return str(label) if label else node.id[:8]
 
 
-def list_nodes_by_class(graph: Dict[str, Any]) -> Dict[str, List[Dict[str, Any]]]:
-    grouped: Dict[str, List[Dict[str, Any]]] = {}
+def list_nodes_by_class(graph: Dict[str, Any]) -> Dict[str, List[Node]]:
+    grouped: Dict[str, List[Node]] = {}
     for node in graph.get("nodes", []):
-        grouped.setdefault(node["class"], []).append(node)
+        grouped.setdefault(node.cls, []).append(node)
     return grouped
 
 
 def select_node(
-    nodes: List[Dict[str, Any]], title: str, allow_skip: bool = False
-) -> Optional[Dict[str, Any]]:
+    nodes: List[Node], title: str, allow_skip: bool = False
+) -> Optional[Node]:
     if not nodes:
         print("No matching nodes found.")
         return None
-    options = [f"{label_for_node(node)} ({node['class']}, {node['id'][:8]})" for node in nodes]
+    options = [f"{label_for_node(node)} ({node.cls}, {node.id[:8]})" for node in nodes]
     selected = select_option(title, options, allow_skip=allow_skip)
     if not selected:
         return None
@@ -91,7 +233,11 @@ def select_node(
     return nodes[index]
 
 
-def create_entity(ontology: Dict[str, Any], graph: Dict[str, Any]) -> None:
+def create_entity(
+    ontology: Dict[str, Any],
+    graph: Dict[str, Any],
+    nodes_by_class: Dict[str, List[Node]],
+) -> None:
     class_name = select_option("Choose a class", get_class_names(ontology))
     if not class_name:
         return
@@ -106,12 +252,9 @@ def create_entity(ontology: Dict[str, Any], graph: Dict[str, Any]) -> None:
         if value:
             values[name] = value
 
-    node = {
-        "id": uuid.uuid4().hex,
-        "class": class_name,
-        "properties": values,
-    }
+    node = Node(id=new_id(), cls=class_name, properties=values)
     graph.setdefault("nodes", []).append(node)
+    nodes_by_class.setdefault(class_name, []).append(node)
     print(f"\nCreated {class_name} {label_for_node(node)}")
 
     object_props = filter_properties(ontology, class_name, "object")
@@ -121,11 +264,16 @@ def create_entity(ontology: Dict[str, Any], graph: Dict[str, Any]) -> None:
     if prompt("Add relationships now? (y/N): ").lower() != "y":
         return
 
-    add_relationships(ontology, graph, node)
+    add_relationships(ontology, graph, nodes_by_class, node)
 
 
-def add_relationships(ontology: Dict[str, Any], graph: Dict[str, Any], source_node: Dict[str, Any]) -> None:
-    object_props = filter_properties(ontology, source_node["class"], "object")
+def add_relationships(
+    ontology: Dict[str, Any],
+    graph: Dict[str, Any],
+    nodes_by_class: Dict[str, List[Node]],
+    source_node: Node,
+) -> None:
+    object_props = filter_properties(ontology, source_node.cls, "object")
     if not object_props:
         print("No object properties available for this class.")
         return
@@ -137,25 +285,22 @@ def add_relationships(ontology: Dict[str, Any], graph: Dict[str, Any], source_no
             break
         prop = next(p for p in object_props if p["name"] == prop_name)
         ranges = prop.get("range", [])
-        candidates = [
-            node
-            for node in graph.get("nodes", [])
-            if node["class"] in ranges
-        ]
+        candidates = list(
+            itertools.chain.from_iterable(nodes_by_class.get(cls, []) for cls in ranges)
+        )
         target = select_node(candidates, "Select target", allow_skip=True)
         if not target:
             continue
-        edge = {
-            "id": uuid.uuid4().hex,
-            "type": prop_name,
-            "from": source_node["id"],
-            "to": target["id"],
-        }
+        edge = Edge(id=new_id(), type=prop_name, src=source_node.id, dst=target.id)
         graph.setdefault("edges", []).append(edge)
         print(f"Linked {label_for_node(source_node)} -> {prop_name} -> {label_for_node(target)}")
 
 
-def link_entities(ontology: Dict[str, Any], graph: Dict[str, Any]) -> None:
+def link_entities(
+    ontology: Dict[str, Any],
+    graph: Dict[str, Any],
+    nodes_by_class: Dict[str, List[Node]],
+) -> None:
     nodes = graph.get("nodes", [])
     if not nodes:
         print("No entities yet. Create one first.")
@@ -163,7 +308,7 @@ def link_entities(ontology: Dict[str, Any], graph: Dict[str, Any]) -> None:
     source = select_node(nodes, "Select source entity")
     if not source:
         return
-    add_relationships(ontology, graph, source)
+    add_relationships(ontology, graph, nodes_by_class, source)
 
 
 def list_entities(graph: Dict[str, Any]) -> None:
@@ -171,18 +316,24 @@ def list_entities(graph: Dict[str, Any]) -> None:
     if not grouped:
         print("No entities in the graph yet.")
         return
-    print("\nEntities")
+    out = ["\nEntities\n"]
     for class_name in sorted(grouped.keys()):
-        print(f"- {class_name} ({len(grouped[class_name])})")
-        for node in grouped[class_name]:
-            print(f"  - {label_for_node(node)} [{node['id'][:8]}]")
+        out.append(f"- {class_name} ({len(grouped[class_name])})\n")
+        out.extend(f"  - {label_for_node(node)} [{node.id[:8]}]\n" for node in grouped[class_name])
+    sys.stdout.write("".join(out))
 
 
 def main() -> None:
     parser = argparse.ArgumentParser(description="Ontology-driven data ingestion")
     parser.add_argument("--ontology", default="ontology/ontology.json", help="Ontology JSON path")
     parser.add_argument("--data", default="data/graph.json", help="Graph data path")
+    parser.add_argument("--journal", default="data/graph.jsonl", help="Delta journal path")
     parser.add_argument("--load", help="Load nodes/edges from a JSON file into the graph store")
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="Write the graph snapshot without indentation (faster to parse, smaller on disk)",
+    )
     parser.add_argument(
         "--non-interactive",
         action="store_true",
@@ -195,46 +346,70 @@ def main() -> None:
         raise SystemExit("Ontology JSON not found. Run scripts/generate_ontology.py first.")
 
     ontology = load_json(ontology_path, {})
-    graph = load_json(Path(args.data), {"nodes": [], "edges": []})
+    data_path = Path(args.data)
+    journal_path = Path(args.journal)
+    graph = graph_from_payload(load_json(data_path, {"nodes": [], "edges": []}))
+    replay_journal(journal_path, graph)
 
     if args.load:
         incoming = load_json(Path(args.load), {"nodes": [], "edges": []})
-        existing_node_ids = {node["id"] for node in graph.get("nodes", [])}
-        existing_edge_ids = {edge["id"] for edge in graph.get("edges", [])}
+        nodes_list = graph.setdefault("nodes", [])
+        edges_list = graph.setdefault("edges", [])
+        existing_node_ids = {node.id for node in nodes_list}
+        existing_edge_ids = {edge.id for edge in edges_list}
 
+        new_nodes = []
         for node in incoming.get("nodes", []):
             if node["id"] not in existing_node_ids:
-                graph.setdefault("nodes", []).append(node)
                 existing_node_ids.add(node["id"])
+                new_nodes.append(Node.from_dict(node))
+        nodes_list.extend(new_nodes)
 
+        new_edges = []
         for edge in incoming.get("edges", []):
             if edge["id"] not in existing_edge_ids:
-                graph.setdefault("edges", []).append(edge)
                 existing_edge_ids.add(edge["id"])
+                new_edges.append(Edge.from_dict(edge))
+        edges_list.extend(new_edges)
 
-        save_json(Path(args.data), graph)
+        compact_journal(data_path, journal_path, graph, compact=args.compact)
         if args.non_interactive:
             return
 
-    while True:
-        print("\nIngestion Menu")
-        print("  1. Create entity")
-        print("  2. Link entities")
-        print("  3. List entities")
-        print("  4. Exit")
-        choice = prompt("Select: ")
-        if choice == "1":
-            create_entity(ontology, graph)
-            save_json(Path(args.data), graph)
-        elif choice == "2":
-            link_entities(ontology, graph)
-            save_json(Path(args.data), graph)
-        elif choice == "3":
-            list_entities(graph)
-        elif choice == "4":
-            break
-        else:
-            print("Invalid choice.")
+    nodes_by_class = list_nodes_by_class(graph)
+    node_count = len(graph.get("nodes", []))
+    edge_count = len(graph.get("edges", []))
+
+    menu = (
+        "\nIngestion Menu\n"
+        "  1. Create entity\n"
+        "  2. Link entities\n"
+        "  3. List entities\n"
+        "  4. Compact journal\n"
+        "  5. Exit\n"
+    )
+    try:
+        while True:
+            sys.stdout.write(menu)
+            choice = prompt("Select: ")
+            if choice == "1":
+                create_entity(ontology, graph, nodes_by_class)
+                node_count, edge_count = journal_deltas(journal_path, graph, node_count, edge_count)
+            elif choice == "2":
+                link_entities(ontology, graph, nodes_by_class)
+                node_count, edge_count = journal_deltas(journal_path, graph, node_count, edge_count)
+            elif choice == "3":
+                list_entities(graph)
+            elif choice == "4":
+                compact_journal(data_path, journal_path, graph, compact=args.compact)
+            elif choice == "5":
+                break
+            else:
+                print("Invalid choice.")
+    except (KeyboardInterrupt, EOFError):
+        print()
+    finally:
+        compact_journal(data_path, journal_path, graph, compact=args.compact)
 
 
 if __name__ == "__main__":
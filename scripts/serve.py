@@ -6,11 +6,25 @@ from __future__ import annotations
 import argparse
 import functools
 import http.server
-import socketserver
 from pathlib import Path
 import sys
 
 
+class StaticHandler(http.server.SimpleHTTPRequestHandler):
+    def copyfile(self, source, outputfile):
+        if outputfile is self.wfile:
+            try:
+                self.wfile.flush()
+                self.connection.sendfile(source)
+                return
+            except (AttributeError, OSError, ValueError):
+                # Not a regular file (e.g. generated directory listings) or
+                # sendfile unsupported; the file position is already advanced
+                # past whatever was sent, so the fallback resumes correctly.
+                pass
+        super().copyfile(source, outputfile)
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(description="Serve the SintOlogy UI")
     parser.add_argument("--port", type=int, default=8000, help="Port to bind")
@@ -18,9 +32,9 @@ def main() -> None:
     args = parser.parse_args()
 
     root = Path(args.root).resolve()
-    handler = functools.partial(http.server.SimpleHTTPRequestHandler, directory=str(root))
+    handler = functools.partial(StaticHandler, directory=str(root))
 
-    with socketserver.TCPServer(("", args.port), handler) as httpd:
+    with http.server.ThreadingHTTPServer(("", args.port), handler) as httpd:
         print(f"Serving {root} at http://localhost:{args.port}/web/")
         try:
             httpd.serve_forever()